@@ -3,9 +3,13 @@
 """This module implements cutout functionality similar to fitscut."""
 
 import os
+import logging
+import threading
 import warnings
 import numpy as np
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from time import time
 
 from astropy import log
@@ -20,6 +24,34 @@ from PIL import Image
 from .utils.utils import parse_size_input, get_cutout_limits, get_cutout_wcs, get_fits
 from .exceptions import InputWarning, DataWarning, InvalidQueryError, InvalidInputError
 
+# Maximum number of input files fits_cut will cut out from concurrently
+_MAX_FILE_WORKERS = 8
+
+
+
+class _ThreadLogCapture(logging.Filter):
+    """
+    Logger filter that diverts the records logged by capturing threads into
+    per-thread lists, and lets the records from all other threads through.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.captures = {}
+
+    def filter(self, record):
+        log_list = self.captures.get(record.thread)
+        if log_list is None:
+            return True
+        log_list.append(record)
+        return False
+
+
+_LOG_CAPTURE = _ThreadLogCapture()
+
+# Guards the adding/removing of captures (and of the filter itself) in _hducut
+_LOG_CAPTURE_LOCK = threading.Lock()
+
 
 def _hducut(img_hdu, center_coord, cutout_size, correct_wcs=False, verbose=False):
     """
@@ -56,13 +88,21 @@ def _hducut(img_hdu, center_coord, cutout_size, correct_wcs=False, verbose=False
     # INFO message which will indicate that we need to remove existing SIP keywords
     # from a WCS whose CTYPE does not include SIP. In this we are taking the CTYPE to be
     # correct and adjusting the header keywords to match.
-    hdlrs = log.handlers
-    log.handlers = []
-    with log.log_to_list() as log_list:        
+    # Only this thread's records are captured, so cutouts being made in other threads
+    # (as in `fits_cut`) still log through the handlers as usual.
+    thread_id = threading.get_ident()
+    log_list = []
+    with _LOG_CAPTURE_LOCK:
+        if not _LOG_CAPTURE.captures:
+            log.addFilter(_LOG_CAPTURE)
+        _LOG_CAPTURE.captures[thread_id] = log_list
+    try:
         img_wcs = wcs.WCS(hdu_header, relax=True)
-
-    for hd in hdlrs:
-        log.addHandler(hd)
+    finally:
+        with _LOG_CAPTURE_LOCK:
+            del _LOG_CAPTURE.captures[thread_id]
+            if not _LOG_CAPTURE.captures:
+                log.removeFilter(_LOG_CAPTURE)
 
     no_sip = False
     if (len(log_list) > 0):
@@ -76,10 +116,12 @@ def _hducut(img_hdu, center_coord, cutout_size, correct_wcs=False, verbose=False
             for log_rec in log_list:
                 log.log(log_rec.levelno, log_rec.msg, extra={"origin": log_rec.name})
 
-    img_data = img_hdu.data
+    # Using the section interface so that only the pixels (or, for compressed images, the tiles)
+    # overlapping the cutout are read, rather than the whole image
+    img_section = img_hdu.section
 
     if verbose:
-        print("Original image shape: {}".format(img_data.shape))
+        print("Original image shape: {}".format(img_section.shape))
 
     # Get cutout limits
     cutout_lims = get_cutout_limits(img_wcs, center_coord, cutout_size)
@@ -92,7 +134,7 @@ def _hducut(img_hdu, center_coord, cutout_size, correct_wcs=False, verbose=False
     xmin, xmax = cutout_lims[0]
     ymin, ymax = cutout_lims[1]
 
-    ymax_img, xmax_img = img_data.shape
+    ymax_img, xmax_img = img_section.shape
 
     # Check the cutout is on the image
     if (xmax <= 0) or (xmin >= xmax_img) or (ymax <= 0) or (ymin >= ymax_img):
@@ -113,11 +155,16 @@ def _hducut(img_hdu, center_coord, cutout_size, correct_wcs=False, verbose=False
         padding[0, 1] = ymax - ymax_img
         ymax = ymax_img  
         
-    img_cutout = img_hdu.data[ymin:ymax, xmin:xmax]
+    img_cutout = img_section[ymin:ymax, xmin:xmax]
 
     # Adding padding to the cutout so that it's the expected size
     if padding.any():  # only do if we need to pad
-        img_cutout = np.pad(img_cutout, padding, 'constant', constant_values=np.nan)
+        padded_shape = np.array(img_cutout.shape) + padding.sum(axis=1)
+        # (promoting integer images to float, so the padding is really NaN)
+        padded_cutout = np.full(padded_shape, np.nan, dtype=np.result_type(img_cutout.dtype, np.float32))
+        padded_cutout[padding[0, 0]:padding[0, 0] + img_cutout.shape[0],
+                      padding[1, 0]:padding[1, 0] + img_cutout.shape[1]] = img_cutout
+        img_cutout = padded_cutout
 
     if verbose:
         print("Image cutout shape: {}".format(img_cutout.shape))
@@ -181,6 +228,74 @@ def _parse_extensions(infile_exts, infile_name, user_exts):
 
     return cutout_exts
 
+
+def _fits_cut_file(in_fle, coordinates, cutout_size, correct_wcs=False, extension=None, verbose=False):
+    """
+    Makes the requested cutout(s) from a single fits file, this is the per-file work of `fits_cut`.
+
+    Parameters
+    ----------
+    in_fle : str
+        The fits image file to cutout from.
+    coordinates : `~astropy.coordinates.SkyCoord`
+        The position around which to cutout.
+    cutout_size : array
+        The size of the cutout as [nx,ny], as returned by `~astrocut.utils.utils.parse_size_input`.
+    correct_wcs : bool
+        Default False. If true a new WCS will be created for the cutout that is tangent projected
+        and does not include distortions.
+    extension : list of ints, None, or 'all'
+       Optional, default None. Default is to cutout the first extension that has image data.
+       The user can also supply one or more extensions to cutout from (integers), or 'all'.
+    verbose : bool
+        Default False. If true intermediate information is printed.
+
+    Returns
+    -------
+    response : tuple
+        The list of cutout `~astropy.io.fits.hdu.image.ImageHDU` objects, the number of
+        cutouts attempted, and the number of those that were empty or failed.
+    """
+
+    if verbose:
+        print("\nCutting out {}".format(in_fle))
+
+    fsspec_kwargs = {"anon": True} if "s3://" in in_fle else None
+
+    cutouts = []
+    num_empty = 0
+    with fits.open(in_fle, mode='denywrite', memmap=True, fsspec_kwargs=fsspec_kwargs) as hdulist:
+
+        # Sorting out which extension(s) to cutout
+        # (checking the header rather than the data so the image arrays aren't read in)
+        all_inds = np.where([x.is_image and (x.header.get("NAXIS", 0) > 0) for x in hdulist])[0]
+        cutout_inds = _parse_extensions(all_inds, in_fle, extension)
+
+        for ind in cutout_inds:            
+            try:
+                cutout = _hducut(hdulist[ind], coordinates, cutout_size,
+                                 correct_wcs=correct_wcs, verbose=verbose)
+
+                # Check that there is data in the cutout image
+                if (cutout.data == 0).all() or (np.isnan(cutout.data)).all():
+                    cutout.header["EMPTY"] = (True, "Indicates no data in cutout image.")
+                    num_empty += 1
+
+                # Adding a few more keywords
+                cutout.header["ORIG_EXT"] = (ind, "Extension in original file.")
+                if not cutout.header.get("ORIG_FLE") and hdulist[0].header.get("FILENAME"):
+                    cutout.header["ORIG_FLE"] = hdulist[0].header.get("FILENAME")
+                
+                cutouts.append(cutout)
+                
+            except OSError as err:
+                warnings.warn((f"Error {err} encountered when performing cutout on {in_fle}, "
+                               f"extension {ind}, skipping..."),
+                              DataWarning)
+                num_empty += 1
+
+    return cutouts, len(cutout_inds), num_empty
+
                     
 def fits_cut(input_files, coordinates, cutout_size, correct_wcs=False, extension=None, 
              single_outfile=True, cutout_prefix="cutout", output_dir='.',
@@ -267,47 +382,24 @@ def fits_cut(input_files, coordinates, cutout_size, correct_wcs=False, extension
         print(f"Cutout size: {cutout_size}")
 
     # Making the cutouts
+    # The files are independent, so they are cut out in a thread pool to overlap the file
+    # (or cloud) access latencies, results are collected in input file order.
+    # When verbose a single worker is used, so the printed output for each file stays together.
+    warnings.filterwarnings("ignore", category=wcs.FITSFixedWarning)
+    cut_file = partial(_fits_cut_file, coordinates=coordinates, cutout_size=cutout_size,
+                       correct_wcs=correct_wcs, extension=extension, verbose=verbose)
+    num_workers = 1 if verbose else max(1, min(_MAX_FILE_WORKERS, len(input_files)))
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        file_results = list(executor.map(cut_file, input_files))
+
     cutout_hdu_dict = {}
     num_empty = 0
     num_cutouts = 0
-    fsspec_kwargs = None
-    for in_fle in input_files:
-        if verbose:
-            print("\nCutting out {}".format(in_fle))
-
-        if "s3://" in in_fle:
-            fsspec_kwargs = {"anon": True}
-
-        warnings.filterwarnings("ignore", category=wcs.FITSFixedWarning)
-        with fits.open(in_fle, mode='denywrite', memmap=True, fsspec_kwargs=fsspec_kwargs) as hdulist:
-
-            # Sorting out which extension(s) to cutout
-            all_inds = np.where([x.is_image and (x.data is not None) for x in hdulist])[0]
-            cutout_inds = _parse_extensions(all_inds, in_fle, extension)
-
-            num_cutouts += len(cutout_inds)
-            for ind in cutout_inds:            
-                try:
-                    cutout = _hducut(hdulist[ind], coordinates, cutout_size,
-                                     correct_wcs=correct_wcs, verbose=verbose)
-
-                    # Check that there is data in the cutout image
-                    if (cutout.data == 0).all() or (np.isnan(cutout.data)).all():
-                        cutout.header["EMPTY"] = (True, "Indicates no data in cutout image.")
-                        num_empty += 1
-
-                    # Adding a few more keywords
-                    cutout.header["ORIG_EXT"] = (ind, "Extension in original file.")
-                    if not cutout.header.get("ORIG_FLE") and hdulist[0].header.get("FILENAME"):
-                        cutout.header["ORIG_FLE"] = hdulist[0].header.get("FILENAME")
-                    
-                    cutout_hdu_dict[in_fle] = cutout_hdu_dict.get(in_fle, []) + [cutout]
-                    
-                except OSError as err:
-                    warnings.warn((f"Error {err} encountered when performing cutout on {in_fle}, "
-                                   f"extension {ind}, skipping..."),
-                                  DataWarning)
-                    num_empty += 1
+    for in_fle, (file_cutouts, file_num_cutouts, file_num_empty) in zip(input_files, file_results):
+        if file_cutouts:
+            cutout_hdu_dict[in_fle] = cutout_hdu_dict.get(in_fle, []) + file_cutouts
+        num_cutouts += file_num_cutouts
+        num_empty += file_num_empty
 
     # If no cutouts contain data, raise exception
     if num_empty == num_cutouts:
@@ -543,7 +635,8 @@ def img_cut(input_files, coordinates, cutout_size, stretch='asinh', minmax_perce
         with fits.open(in_fle, mode='denywrite', memmap=True) as hdulist:
 
             # Sorting out which extension(s) to cutout
-            all_inds = np.where([x.is_image and (x.data is not None) for x in hdulist])[0]
+            # (checking the header rather than the data so the image arrays aren't read in)
+            all_inds = np.where([x.is_image and (x.header.get("NAXIS", 0) > 0) for x in hdulist])[0]
             cutout_inds = _parse_extensions(all_inds, in_fle, extension)
 
             for ind in cutout_inds:   
@@ -106,13 +106,11 @@ def test_fits_cut(tmpdir, capsys, ffi_type):
 
     # Test when cutout is in some images not others
 
-    # Putting zeros into 2 images
-    for img in test_images[:2]:
-        hdu = fits.open(img, mode="update")
-        hdu[0].data[:20, :] = 0
-        hdu.flush()
-        hdu.close()
-        
+    # Versions of the test images with zeros in the first 20 rows,
+    # used in place of the first 2 images
+    zeroed_images = create_test_imgs(ffi_type, 50, 6, dir_name=tmpdir, basename="img_zeroed_{:04d}.fits",
+                                     zero_rows=20)
+    test_images = zeroed_images[:2] + test_images[2:]
         
     center_coord = SkyCoord("150.1163213 2.2007", unit='deg')
     cutout_file = cutouts.fits_cut(test_images, center_coord, cutout_size, single_outfile=True, output_dir=tmpdir)
@@ -132,11 +130,7 @@ def test_fits_cut(tmpdir, capsys, ffi_type):
     assert len(cutout_files) == len(test_images) - 2
 
     # Test when cutout is in no images
-    for img in test_images[2:]:
-        hdu = fits.open(img, mode="update")
-        hdu[0].data[:20, :] = 0
-        hdu.flush()
-        hdu.close()
+    test_images = zeroed_images
 
     with pytest.raises(Exception) as e:
         cutout_file = cutouts.fits_cut(test_images, center_coord, cutout_size, single_outfile=True, output_dir=tmpdir)
@@ -194,6 +188,27 @@ def test_fits_cut(tmpdir, capsys, ffi_type):
         assert cutout_hdulist[1].data.shape == (15, 10)
 
 
+def test_fits_cut_int_image(tmpdir):
+
+    # Integer version of a test image
+    test_image = create_test_imgs('SPOC', 50, 1, dir_name=tmpdir)[0]
+    int_image = path.join(tmpdir, "img_int.fits")
+    with fits.open(test_image) as hdulist:
+        hdulist[0].data = hdulist[0].data.astype(np.int32)
+        hdulist.writeto(int_image)
+
+    # Off the edge cutout, the padding should be NaN rather than an integer fill value
+    center_coord = SkyCoord("150.1163213 2.2005731", unit='deg')
+    cutout_size = 10
+    cutout_hdulist = cutouts.fits_cut(int_image, center_coord, cutout_size, memory_only=True)[0]
+
+    cut1 = cutout_hdulist[1].data
+    assert cut1.shape == (cutout_size, cutout_size)
+    assert np.issubdtype(cut1.dtype, np.floating)
+    assert np.isnan(cut1[:cutout_size//2, :]).all()
+    assert np.isfinite(cut1).any()
+
+
 def test_normalize_img():
 
     # basic linear stretch
@@ -1,3 +1,5 @@
+import pytest
+
 import numpy as np
 
 from astropy.io import fits
@@ -14,7 +16,9 @@ with open(get_pkg_data_filename('data/ex_ffi_wcs.txt'), "r") as FLE:
     WCS_STR = FLE.read()
 
     
-def test_get_cutout_limits():
+@pytest.fixture(scope="module")
+def test_img_wcs():
+    """Simple test image WCS, shared by the tests in this module (none of which modify it)"""
 
     test_img_wcs_kwds = fits.Header(cards=[('NAXIS', 2, 'number of array dimensions'),
                                            ('NAXIS1', 20, ''),
@@ -33,7 +37,10 @@ def test_get_cutout_limits():
                                            ('CUNIT1', 'deg', 'Units of coordinate increment and value'),
                                            ('CUNIT2', 'deg', 'Units of coordinate increment and value')])
     
-    test_img_wcs = wcs.WCS(test_img_wcs_kwds)
+    return wcs.WCS(test_img_wcs_kwds)
+
+
+def test_get_cutout_limits(test_img_wcs):
 
     center_coord = SkyCoord("100 20", unit='deg')
     cutout_size = [10, 10]
@@ -68,25 +75,35 @@ def test_get_cutout_limits():
     assert lims[1, 0] < 0
 
 
-def test_get_cutout_wcs():
-    test_img_wcs_kwds = fits.Header(cards=[('NAXIS', 2, 'number of array dimensions'),
-                                           ('NAXIS1', 20, ''),
-                                           ('NAXIS2', 30, ''),
-                                           ('CTYPE1', 'RA---TAN', 'Right ascension, gnomonic projection'),
-                                           ('CTYPE2', 'DEC--TAN', 'Declination, gnomonic projection'),
-                                           ('CRVAL1', 100, '[deg] Coordinate value at reference point'),
-                                           ('CRVAL2', 20, '[deg] Coordinate value at reference point'),
-                                           ('CRPIX1', 10, 'Pixel coordinate of reference point'),
-                                           ('CRPIX2', 15, 'Pixel coordinate of reference point'),
-                                           ('CDELT1', 1.0, '[deg] Coordinate increment at reference point'),
-                                           ('CDELT2', 1.0, '[deg] Coordinate increment at reference point'),
-                                           ('WCSAXES', 2, 'Number of coordinate axes'),
-                                           ('PC1_1', 1, 'Coordinate transformation matrix element'),
-                                           ('PC2_2', 1, 'Coordinate transformation matrix element'),
-                                           ('CUNIT1', 'deg', 'Units of coordinate increment and value'),
-                                           ('CUNIT2', 'deg', 'Units of coordinate increment and value')])
-    
-    test_img_wcs = wcs.WCS(test_img_wcs_kwds)
+def test_get_cutout_limits_batch(test_img_wcs):
+
+    center_coords = SkyCoord([100, 90, 100], [20, 20, 5], unit='deg')
+
+    # The test wcs has 1 deg pixels, so the half sizes are the same for pixel and degree sizes
+    for cutout_size, half_size in (([10, 10], [5, 5]), ([10, 5], [5, 2.5]),
+                                   ([4, 5]*u.deg, [2, 2.5]), ([4, 5]*u.pixel, [2, 2.5])):
+        lims = utils.get_cutout_limits_batch(test_img_wcs, center_coords, cutout_size)
+        assert lims.shape == (3, 2, 2)
+
+        for coord, coord_lims in zip(center_coords, lims):
+            center_pixel = np.array(coord.to_pixel(test_img_wcs, 1))
+            assert (coord_lims[:, 0] == np.round(center_pixel - 1 - half_size)).all()
+            assert (coord_lims[:, 1] == np.round(center_pixel - 1 + half_size)).all()
+
+    lims = utils.get_cutout_limits_batch(test_img_wcs, center_coords, [10, 10])
+    assert (lims[0] == np.array([[4, 14], [9, 19]])).all()
+
+    lims = utils.get_cutout_limits_batch(test_img_wcs, center_coords, [4, 5]*u.deg)
+    assert (lims[0, :, 0] == [7, 11]).all()
+    assert lims[1, 0, 0] < 0
+    assert lims[2, 1, 0] < 0
+
+    # The case where the requested area rounds to zero
+    lims = utils.get_cutout_limits_batch(test_img_wcs, center_coords, [.1, .1]*u.deg)
+    assert ((lims[:, :, 1] - lims[:, :, 0]) == 1).all()
+
+
+def test_get_cutout_wcs(test_img_wcs):
 
     center_coord = SkyCoord("100 20", unit='deg')
     cutout_size = [4, 5]*u.deg
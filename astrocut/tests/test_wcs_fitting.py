@@ -0,0 +1,127 @@
+import pytest
+
+import numpy as np
+
+from astropy import wcs
+from astropy.coordinates import SkyCoord
+
+from ..utils import wcs_fitting
+from ..utils.wcs_fitting import fit_wcs_from_points
+
+
+@pytest.fixture(scope="module")
+def tan_wcs():
+    """Simple TAN WCS (roughly TESS pixel scale, slightly rotated) to generate matched points from"""
+
+    tan_wcs = wcs.WCS(naxis=2)
+    tan_wcs.wcs.ctype = ['RA---TAN', 'DEC--TAN']
+    tan_wcs.wcs.crval = [150.1, 2.2]
+    tan_wcs.wcs.crpix = [3, 2]
+    tan_wcs.wcs.cd = [[-0.0058, 0.0003], [0.0002, 0.0058]]
+
+    return tan_wcs
+
+
+def _max_separation(true_wcs, fit_wcs, xp, yp):
+    """Maximum separation in degrees between the two WCSs, evaluated at the given pixels"""
+
+    true_coords = SkyCoord(*true_wcs.all_pix2world(xp, yp, 0), unit='deg')
+    fit_coords = SkyCoord(*fit_wcs.all_pix2world(xp, yp, 0), unit='deg')
+
+    return true_coords.separation(fit_coords).deg.max()
+
+
+def _pixel_grid(nx, ny):
+
+    xp, yp = np.meshgrid(np.arange(nx), np.arange(ny))
+    return xp.ravel(), yp.ravel()
+
+
+def test_fit_wcs_center(tan_wcs):
+
+    xp, yp = _pixel_grid(10, 12)
+    world_coords = SkyCoord(*tan_wcs.all_pix2world(xp, yp, 0), unit='deg')
+
+    fit_wcs = fit_wcs_from_points([xp, yp], world_coords, proj_point='center')
+    assert _max_separation(tan_wcs, fit_wcs, xp, yp) < 1e-6
+    assert fit_wcs.pixel_shape == (10, 12)
+
+
+def test_fit_wcs_proj_point(tan_wcs):
+
+    xp, yp = _pixel_grid(10, 12)
+    world_coords = SkyCoord(*tan_wcs.all_pix2world(xp, yp, 0), unit='deg')
+    proj_point = SkyCoord(*tan_wcs.wcs.crval, unit='deg')
+
+    fit_wcs = fit_wcs_from_points([xp, yp], world_coords, proj_point=proj_point)
+    assert _max_separation(tan_wcs, fit_wcs, xp, yp) < 1e-8
+    assert np.allclose(fit_wcs.wcs.crval, tan_wcs.wcs.crval)
+    assert np.allclose(fit_wcs.wcs.crpix, tan_wcs.wcs.crpix)
+
+    with pytest.raises(ValueError):
+        fit_wcs_from_points([xp, yp], world_coords, proj_point='middle')
+
+
+def test_fit_wcs_single_row(tan_wcs):
+
+    # A single row of points doesn't constrain the linear terms, so the least squares fallback is used
+    xp = np.arange(10)
+    yp = np.full(10, 4)
+    world_coords = SkyCoord(*tan_wcs.all_pix2world(xp, yp, 0), unit='deg')
+
+    fit_wcs = fit_wcs_from_points([xp, yp], world_coords, proj_point='center')
+    assert _max_separation(tan_wcs, fit_wcs, xp, yp) < 1e-5
+
+
+def test_fit_wcs_projection_wcs(tan_wcs):
+
+    xp, yp = _pixel_grid(10, 12)
+    world_coords = SkyCoord(*tan_wcs.all_pix2world(xp, yp, 0), unit='deg')
+
+    template_wcs = wcs.WCS(naxis=2)
+    template_wcs.wcs.ctype = ['RA---TAN', 'DEC--TAN']
+
+    fit_wcs = fit_wcs_from_points([xp, yp], world_coords, projection=template_wcs)
+    assert _max_separation(tan_wcs, fit_wcs, xp, yp) < 1e-6
+
+    with pytest.raises(ValueError):
+        fit_wcs_from_points([xp, yp], world_coords, projection='BAD')
+
+
+def test_fit_wcs_sip(tan_wcs):
+
+    xp, yp = _pixel_grid(10, 12)
+    world_coords = SkyCoord(*tan_wcs.all_pix2world(xp, yp, 0), unit='deg')
+
+    fit_wcs = fit_wcs_from_points([xp, yp], world_coords, proj_point='center', sip_degree=3)
+    assert fit_wcs.sip is not None
+    assert fit_wcs.sip.a.shape == (4, 4)
+    assert _max_separation(tan_wcs, fit_wcs, xp, yp) < 1e-5
+
+    with pytest.raises(ValueError):
+        fit_wcs_from_points([xp, yp], world_coords, sip_degree=2.5)
+
+
+@pytest.mark.parametrize('backend', ['loop', 'numba'])
+def test_sip_eval_backends(backend):
+
+    rng = np.random.default_rng(42)
+    du, dv = rng.uniform(-50, 50, (2, 100))
+    u_exp, v_exp = np.array([(i, j) for i in range(4) for j in range(4) if 1 < (i+j) < 4], dtype=np.intp).T
+    a_params, b_params = rng.uniform(-1e-5, 1e-5, (2, len(u_exp)))
+
+    expected = np.empty((2, len(du)))
+    wcs_fitting._sip_eval_numpy(a_params, b_params, du, dv, u_exp, v_exp, expected[0], expected[1])
+
+    if backend == 'loop':
+        sip_eval = wcs_fitting._sip_eval_loop
+    else:
+        pytest.importorskip('numba')
+        sip_eval = wcs_fitting._get_sip_eval()  # the compiled kernel the SIP fit uses
+        assert sip_eval is not wcs_fitting._sip_eval_numpy
+
+    result = np.empty((2, len(du)))
+    sip_eval(a_params, b_params, du, dv, u_exp, v_exp, result[0], result[1])
+
+    # fastmath allows reordering, so only close agreement is expected
+    assert np.allclose(result, expected, rtol=1e-10, atol=1e-12)
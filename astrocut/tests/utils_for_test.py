@@ -206,11 +206,13 @@ def add_bad_sip_keywords(hdu):
     hdu.header['B_DMAX'] = 44.62692873032506
     
 
-def create_test_imgs(product, img_size, num_images, bad_sip_keywords=False, dir_name=".", basename='img_{:04d}.fits'):
+def create_test_imgs(product, img_size, num_images, bad_sip_keywords=False, dir_name=".", basename='img_{:04d}.fits',
+                     zero_rows=0):
     """
     Create test fits image files, single extension.
 
-    Write unique values for all the pixels. 
+    Write unique values for all the pixels, except for the first ``zero_rows`` rows
+    of each image, which are set to zero.
     The header keywords are populated with a simple WCS for testing.
     """
 
@@ -222,7 +224,10 @@ def create_test_imgs(product, img_size, num_images, bad_sip_keywords=False, dir_
         
         file_list.append(basename.format(i))
 
-        primary_hdu = fits.PrimaryHDU(data=img)
+        img_data = img.copy()
+        img_data[:zero_rows, :] = 0
+
+        primary_hdu = fits.PrimaryHDU(data=img_data)
         add_wcs_nosip_keywords(primary_hdu, img_size, product)
 
         if bad_sip_keywords:
@@ -52,6 +52,40 @@ def parse_size_input(cutout_size):
     return cutout_size
 
 
+def _get_cutout_half_size(img_wcs, cutout_size):
+    """
+    Takes the cutout size, and the wcs from which the cutout is being taken
+    and returns the half width of the cutout along each axis in pixels.
+
+    Parameters
+    ----------
+    img_wcs : `~astropy.wcs.WCS`
+        The WCS for the image that the cutout is being cut from.
+    cutout_size : array
+        [nx,ny] in with ints (pixels) or astropy quantities
+
+    Returns
+    -------
+    response : `numpy.array`
+        The cutout half sizes in pixels, in the form [nx/2, ny/2]
+    """
+
+    dims = np.zeros(2)
+
+    for axis, size in enumerate(cutout_size):
+        
+        if not isinstance(size, u.Quantity):  # assume pixels
+            dims[axis] = size / 2
+        elif size.unit == u.pixel:  # also pixels
+            dims[axis] = size.value / 2
+        elif size.unit.physical_type == 'angle':
+            pixel_scale = u.Quantity(wcs.utils.proj_plane_pixel_scales(img_wcs)[axis],
+                                     img_wcs.wcs.cunit[axis])
+            dims[axis] = (size / pixel_scale).decompose().value / 2
+
+    return dims
+
+
 def get_cutout_limits(img_wcs, center_coord, cutout_size):
     """
     Takes the center coordinates, cutout size, and the wcs from
@@ -75,37 +109,58 @@ def get_cutout_limits(img_wcs, center_coord, cutout_size):
     response : `numpy.array`
         The cutout pixel limits in an array of the form [[xmin,xmax],[ymin,ymax]]
     """
+
+    return get_cutout_limits_batch(img_wcs, center_coord.reshape((1,)), cutout_size)[0]
+
+
+def get_cutout_limits_batch(img_wcs, center_coords, cutout_size):
+    """
+    Takes an array of center coordinates, a cutout size, and the wcs from
+    which the cutouts are being taken and returns the x and y pixel limits
+    for each cutout. All of the center coordinates are transformed to pixels
+    in a single call.
+
+    Note: This function does no bounds checking, so the returned limits are not 
+          guaranteed to overlap the original image.
+
+    Parameters
+    ----------
+    img_wcs : `~astropy.wcs.WCS`
+        The WCS for the image that the cutouts are being cut from.
+    center_coords : `~astropy.coordinates.SkyCoord`
+        Array of central coordinates for the cutouts
+    cutout_size : array
+        [nx,ny] in with ints (pixels) or astropy quantities, used for all cutouts
+
+    Returns
+    -------
+    response : `numpy.array`
+        The cutout pixel limits in an array of the form [[[xmin,xmax],[ymin,ymax]], ...],
+        with one entry per center coordinate.
+    """
         
-    # Note: This is returning the center pixel in 1-up
+    # Note: This is returning the center pixels in 1-up
     try:
-        center_pixel = center_coord.to_pixel(img_wcs, 1)
+        center_pixels = np.column_stack(center_coords.to_pixel(img_wcs, 1))
     except wcs.NoConvergence:  # If wcs can't converge, center coordinate is far from the footprint
         raise InvalidQueryError("Cutout location is not in image footprint!")
 
     # For some reason you can sometimes get nans without a no convergance error
-    if np.isnan(center_pixel).all():
+    if np.isnan(center_pixels).any():
         raise InvalidQueryError("Cutout location is not in image footprint!")
     
-    lims = np.zeros((2, 2), dtype=int)
+    dims = _get_cutout_half_size(img_wcs, cutout_size)
 
-    for axis, size in enumerate(cutout_size):
-        
-        if not isinstance(size, u.Quantity):  # assume pixels
-            dim = size / 2
-        elif size.unit == u.pixel:  # also pixels
-            dim = size.value / 2
-        elif size.unit.physical_type == 'angle':
-            pixel_scale = u.Quantity(wcs.utils.proj_plane_pixel_scales(img_wcs)[axis],
-                                     img_wcs.wcs.cunit[axis])
-            dim = (size / pixel_scale).decompose() / 2
-
-        lims[axis, 0] = int(np.round(center_pixel[axis] - 1 - dim))
-        lims[axis, 1] = int(np.round(center_pixel[axis] - 1 + dim))
+    lims = np.zeros((len(center_pixels), 2, 2), dtype=int)
+    lims[:, :, 0] = np.round(center_pixels - 1 - dims)
+    lims[:, :, 1] = np.round(center_pixels - 1 + dims)
 
-        # The case where the requested area is so small it rounds to zero
-        if lims[axis, 0] == lims[axis, 1]:
-            lims[axis, 0] = int(np.floor(center_pixel[axis] - 1))
-            lims[axis, 1] = lims[axis, 0] + 1
+    # The case where the requested area is so small it rounds to zero
+    too_small = lims[:, :, 0] == lims[:, :, 1]
+    if too_small.any():
+        floor_pixels = np.floor(center_pixels - 1).astype(int)
+        lims[:, :, 0] = np.where(too_small, floor_pixels, lims[:, :, 0])
+        lims[:, :, 1] = np.where(too_small, floor_pixels + 1, lims[:, :, 1])
 
     return lims
 
@@ -113,7 +168,7 @@ def get_cutout_limits(img_wcs, center_coord, cutout_size):
 def get_cutout_wcs(img_wcs, cutout_lims):
     """
     Starting with the full image WCS and adjusting it for the cutout WCS.
-    Adjusts CRPIX values and adds physical WCS keywords.
+    Adjusts CRPIX values (including the SIP reference pixel, if present).
 
     Parameters
     ----------
@@ -128,30 +183,23 @@ def get_cutout_wcs(img_wcs, cutout_lims):
         The cutout WCS object including SIP distortions if present.
     """
 
-    # relax = True is important when the WCS has sip distortions, otherwise it has no effect
-    wcs_header = img_wcs.to_header(relax=True) 
+    # Copying the WCS and shifting the reference pixel, rather than round tripping
+    # through a header, which would mean re-parsing every card for each cutout
+    cutout_wcs = img_wcs.deepcopy()
+    cutout_wcs.wcs.crpix = cutout_wcs.wcs.crpix - cutout_lims[:, 0]
 
-    # Adjusting the CRPIX values
-    wcs_header["CRPIX1"] -= cutout_lims[0, 0]
-    wcs_header["CRPIX2"] -= cutout_lims[1, 0]
+    if cutout_wcs.sip is not None:
+        sip = cutout_wcs.sip
+        cutout_wcs.sip = wcs.Sip(sip.a, sip.b, sip.ap, sip.bp, cutout_wcs.wcs.crpix)
 
-    # Adding the physical wcs keywords
-    wcs_header.set("WCSNAMEP", "PHYSICAL", "name of world coordinate system alternate P")
-    wcs_header.set("WCSAXESP", 2, "number of WCS physical axes")
-    
-    wcs_header.set("CTYPE1P", "RAWX", "physical WCS axis 1 type CCD col")
-    wcs_header.set("CUNIT1P", "PIXEL", "physical WCS axis 1 unit")
-    wcs_header.set("CRPIX1P", 1, "reference CCD column")
-    wcs_header.set("CRVAL1P", cutout_lims[0, 0] + 1, "value at reference CCD column")
-    wcs_header.set("CDELT1P", 1.0, "physical WCS axis 1 step")
-                
-    wcs_header.set("CTYPE2P", "RAWY", "physical WCS axis 2 type CCD col")
-    wcs_header.set("CUNIT2P", "PIXEL", "physical WCS axis 2 unit")
-    wcs_header.set("CRPIX2P", 1, "reference CCD row")
-    wcs_header.set("CRVAL2P", cutout_lims[1, 0] + 1, "value at reference CCD row")
-    wcs_header.set("CDELT2P", 1.0, "physical WCS axis 2 step")
-
-    return wcs.WCS(wcs_header)
+    # Lookup table distortions are not carried over (as they would not be by a header round trip)
+    cutout_wcs.cpdis1 = cutout_wcs.cpdis2 = None
+    cutout_wcs.det2im1 = cutout_wcs.det2im2 = None
+
+    # The cutout WCS does not have the shape of the full image
+    cutout_wcs.pixel_shape = None
+
+    return cutout_wcs
 
 
 def _build_astrocut_primaryhdu(**keywords):
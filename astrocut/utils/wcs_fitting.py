@@ -15,9 +15,16 @@
 
 # flake8: noqa
 
+import copy
+
+from functools import lru_cache
+
 import numpy as np
 
+from scipy.optimize import least_squares
+
 from astropy import units as u
+from astropy.wcs import Sip
 from astropy.wcs.utils import celestial_frame_to_wcs
 from astropy.coordinates import Angle, SkyCoord, UnitSphericalRepresentation
 
@@ -133,7 +140,72 @@ def directional_offset_by(sky_coord, position_angle, separation):
 
     
 
-def _linear_wcs_fit(params, lon, lat, x, y, w_obj):  # pragma: no cover
+def _sip_eval_loop(a_params, b_params, du, dv, u_exp, v_exp, fuv, guv):  # pragma: no cover
+    """
+    Evaluate the SIP polynomials at (du, dv) into ``fuv`` and ``guv``.
+    Written as explicit loops to be compiled with numba (see `_get_sip_eval`),
+    so no temporary arrays are made for the polynomial terms.
+    """
+    for n in range(du.size):
+        fsum = 0.0
+        gsum = 0.0
+        for k in range(u_exp.size):
+            term = du[n]**u_exp[k] * dv[n]**v_exp[k]
+            fsum += a_params[k] * term
+            gsum += b_params[k] * term
+        fuv[n] = fsum
+        guv[n] = gsum
+
+
+def _sip_eval_numpy(a_params, b_params, du, dv, u_exp, v_exp, fuv, guv):  # pragma: no cover
+    """
+    Evaluate the SIP polynomials at (du, dv) into ``fuv`` and ``guv``.
+    Each column of the basis is one du**p * dv**q term.
+    """
+    basis = du[:, np.newaxis]**u_exp * dv[:, np.newaxis]**v_exp
+    np.dot(basis, a_params, out=fuv)
+    np.dot(basis, b_params, out=guv)
+
+
+@lru_cache(maxsize=None)
+def _get_sip_eval():
+    """
+    Returns the SIP polynomial evaluation function: `_sip_eval_loop` compiled with numba
+    if it is available, otherwise `_sip_eval_numpy`.
+
+    This is done on first use (only SIP fits need it) so that importing astrocut doesn't
+    pay for importing numba. Note that because the kernel is compiled with ``fastmath``
+    results can differ in the last few bits depending on whether numba is installed.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return _sip_eval_numpy
+
+    return njit(cache=True, fastmath=True)(_sip_eval_loop)
+
+
+def _wrapped_resids(a1, a2, b1, b2, resid_buf):  # pragma: no cover
+    """
+    Residuals (a1-a2, b1-b2) wrapped into [-180, 180), computed in place in ``resid_buf``.
+
+    A copy is returned because `~scipy.optimize.least_squares` keeps the residual
+    array from the current point while evaluating the function at nearby points
+    for the jacobian, so the work array can't be handed back directly.
+    """
+    npts = len(a1)
+    np.subtract(a1, a2, out=resid_buf[:npts])
+    np.subtract(b1, b2, out=resid_buf[npts:])
+
+    # wrap into [-180, 180) to avoid bad results if near 360 -> 0 degree crossover
+    resid_buf += 180
+    np.mod(resid_buf, 360, out=resid_buf)
+    resid_buf -= 180
+
+    return resid_buf.copy()
+
+
+def _linear_wcs_fit(params, lon, lat, pix_crd, w_obj, resid_buf):  # pragma: no cover
     """
     Objective function for fitting linear terms.
 
@@ -143,73 +215,78 @@ def _linear_wcs_fit(params, lon, lat, x, y, w_obj):  # pragma: no cover
         6 element array. First 4 elements are PC matrix, last 2 are CRPIX.
     lon, lat: array
         Sky coordinates.
-    x, y: array
-        Pixel coordinates
+    pix_crd: array
+        (N, 2) array of pixel coordinates
     w_obj: `~astropy.wcs.WCS`
         WCS object
+    resid_buf: array
+        Preallocated 2N element work array for the residuals.
         """
-    cd = params[0:4]
-    crpix = params[4:6]
-
-    w_obj.wcs.cd = ((cd[0], cd[1]), (cd[2], cd[3]))
-    w_obj.wcs.crpix = crpix
-    lon2, lat2 = w_obj.wcs_pix2world(x, y, 0)
-
-    resids = np.concatenate((lon-lon2, lat-lat2))
-    resids[resids > 180] = 360 - resids[resids > 180]
-    resids[resids < -180] = 360	+ resids[resids < -180]
+    # the parameter array is float64, so these are views wcslib can take directly
+    w_obj.wcs.cd = params[0:4].reshape((2, 2))
+    w_obj.wcs.crpix = params[4:6]
+    # calling wcslib directly, skipping the wcs_pix2world wrapper overhead
+    world = w_obj.wcs.p2s(pix_crd, 0)['world']
+    lon2, lat2 = world[:, 0], world[:, 1]
 
-    return resids
+    return _wrapped_resids(lon, lon2, lat, lat2, resid_buf)
 
 
-def _sip_fit(params, lon, lat, u, v, w_obj, order, coeff_names):  # pragma: no cover
+def _sip_fit(params, world_crd, u, v, w_obj, u_exp, v_exp, sip_eval, sip_buf, resid_buf):  # pragma: no cover
 
     """ Objective function for fitting SIP.
      Parameters
     -----------
     params : array
         Fittable parameters. First 4 elements are PC matrix, last 2 are CRPIX.
-    lon, lat: array
-        Sky coordinates.
+    world_crd: array
+        (N, 2) array of sky coordinates.
     u, v: array
         Pixel coordinates
     w_obj: `~astropy.wcs.WCS`
         WCS object
+    u_exp, v_exp: array
+        Integer exponents of u and v for each SIP coefficient.
+    sip_eval: function
+        SIP polynomial evaluation function, as returned by `_get_sip_eval`.
+    sip_buf: array
+        Preallocated (2, N) work array for the SIP polynomial values.
+    resid_buf: array
+        Preallocated 2N element work array for the residuals.
     """
 
-    from astropy.modeling.models import SIP, InverseSIP   # here to avoid circular import
-
     # unpack params
     crpix = params[0:2]
     cdx = params[2:6].reshape((2, 2))
-    a_params = params[6:6+len(coeff_names)]
-    b_params = params[6+len(coeff_names):]
+    a_params = params[6:6+len(u_exp)]
+    b_params = params[6+len(u_exp):]
 
     # assign to wcs, used for transfomations in this function
     w_obj.wcs.cd = cdx
     w_obj.wcs.crpix = crpix
 
-    a_coeff, b_coeff = {}, {}
-    for i in range(len(coeff_names)):
-        a_coeff['A_' + coeff_names[i]] = a_params[i]
-        b_coeff['B_' + coeff_names[i]] = b_params[i]
+    # evaluate the SIP polynomials directly (equivalent to the astropy SIP model)
+    fuv, guv = sip_buf
+    sip_eval(a_params, b_params, u - crpix[0], v - crpix[1], u_exp, v_exp, fuv, guv)
 
-    sip = SIP(crpix=crpix, a_order=order, b_order=order,
-              a_coeff=a_coeff, b_coeff=b_coeff)
-    fuv, guv = sip(u, v)
+    # applying the 2x2 CD matrix by hand, np.dot dispatch overhead dominates at this size
+    du = u + fuv - crpix[0]
+    dv = v + guv - crpix[1]
+    xo = cdx[0, 0]*du + cdx[0, 1]*dv
+    yo = cdx[1, 0]*du + cdx[1, 1]*dv
 
-    xo, yo = np.dot(cdx, np.array([u+fuv-crpix[0], v+guv-crpix[1]]))
+    # use all_world2pix in case `projection` contains distortion table,
+    # otherwise call wcslib directly, skipping the wrapper overhead
+    if w_obj.has_distortion:
+        pix = w_obj.all_world2pix(world_crd, 0)
+    else:
+        pix = w_obj.wcs.s2p(world_crd, 0)['pixcrd']
+    dx = pix[:, 0] - crpix[0]
+    dy = pix[:, 1] - crpix[1]
+    x = cdx[0, 0]*dx + cdx[0, 1]*dy
+    y = cdx[1, 0]*dx + cdx[1, 1]*dy
 
-    # use all pix2world in case `projection` contains distortion table
-    x, y = w_obj.all_world2pix(lon, lat, 0)
-    x, y = np.dot(w_obj.wcs.cd, (x-w_obj.wcs.crpix[0], y-w_obj.wcs.crpix[1]))
-
-    resids = np.concatenate((x-xo, y-yo))
-    # to avoid bad restuls if near 360 -> 0 degree crossover
-    resids[resids > 180] = 360 - resids[resids > 180]
-    resids[resids < -180] = 360 + resids[resids < -180]
-
-    return resids
+    return _wrapped_resids(x, xo, y, yo, resid_buf)
 
 
 
@@ -274,11 +351,6 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         The best-fit WCS to the points given.
     """
 
-    from astropy.coordinates import SkyCoord # here to avoid circular import
-    import astropy.units as u
-    from astropy.wcs import Sip
-    from scipy.optimize import least_squares
-
     xp, yp = xy
     try:
         lon, lat = world_coords.data.lon.deg, world_coords.data.lat.deg
@@ -287,11 +359,13 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         lon, lat = unit_sph.lon.deg, unit_sph.lat.deg
 
     # verify input
-    if (proj_point != 'center') and (type(proj_point) != type(world_coords)):
-        raise ValueError("proj_point must be set to 'center', or an" +
-                         "`~astropy.coordinates.SkyCoord` object with " +
-                         "a pair of points.")
-    if proj_point != 'center':
+    # (checking for a string first, comparing a SkyCoord to a string is not supported)
+    center_proj = isinstance(proj_point, str) and proj_point == 'center'
+    if not center_proj:
+        if not isinstance(proj_point, type(world_coords)):
+            raise ValueError("proj_point must be set to 'center', or an" +
+                             "`~astropy.coordinates.SkyCoord` object with " +
+                             "a pair of points.")
         assert proj_point.size == 1
 
     proj_codes = [
@@ -299,7 +373,7 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         'CEA', 'CAR', 'MER', 'SFL', 'PAR', 'MOL', 'AIT', 'COP', 'COE',
         'COD', 'COO', 'BON', 'PCO', 'TSC', 'CSC', 'QSC', 'HPX', 'XPH'
     ]
-    if type(projection) == str:
+    if isinstance(projection, str):
         if projection not in proj_codes:
             raise ValueError("Must specify valid projection code from list of "
                              + "supported types: ", ', '.join(proj_codes))
@@ -316,43 +390,71 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         wcs.wcs.cd = wcs.wcs.pc
         wcs.wcs.__delattr__('pc')
 
-    if (type(sip_degree) != type(None)) and (type(sip_degree) != int):
+    if (sip_degree is not None) and not isinstance(sip_degree, int):
         raise ValueError("sip_degree must be None, or integer.")
 
     # set pixel_shape to span of input points
-    wcs.pixel_shape = (xp.max()+1-xp.min(), yp.max()+1-yp.min())
+    # (the pixel extrema are reused below, rather than reducing over the points again)
+    xpmin, xpmax, ypmin, ypmax = xp.min(), xp.max(), yp.min(), yp.max()
+    wcs.pixel_shape = (xpmax+1-xpmin, ypmax+1-ypmin)
 
     # determine CRVAL from input
-    close = lambda l, p: p[np.argmin(np.abs(l))]
-    if str(proj_point) == 'center':  # use center of input points
-        sc1 = SkyCoord(lon.min()*u.deg, lat.max()*u.deg)
-        sc2 = SkyCoord(lon.max()*u.deg, lat.min()*u.deg)
-        pa = sc1.position_angle(sc2)
-        sep = sc1.separation(sc2)
-        midpoint_sc = directional_offset_by(sc1, pa, sep/2)
-        wcs.wcs.crval = ((midpoint_sc.data.lon.deg, midpoint_sc.data.lat.deg))
-        wcs.wcs.crpix = ((xp.max()+xp.min())/2., (yp.max()+yp.min())/2.)
+    if center_proj:  # use center of input points
+        lonmin, lonmax, latmin, latmax = lon.min(), lon.max(), lat.min(), lat.max()
+        if (lonmax - lonmin < 1) and (latmax - latmin < 1):
+            # For fields under a degree across (and not crossing lon=0 or a pole) the
+            # simple midpoint is within a few arcsec of the great circle midpoint
+            wcs.wcs.crval = ((lonmin + lonmax)/2., (latmin + latmax)/2.)
+        else:
+            sc1 = SkyCoord(lonmin*u.deg, latmax*u.deg)
+            sc2 = SkyCoord(lonmax*u.deg, latmin*u.deg)
+            pa = sc1.position_angle(sc2)
+            sep = sc1.separation(sc2)
+            midpoint_sc = directional_offset_by(sc1, pa, sep/2)
+            wcs.wcs.crval = ((midpoint_sc.data.lon.deg, midpoint_sc.data.lat.deg))
+        wcs.wcs.crpix = ((xpmax+xpmin)/2., (ypmax+ypmin)/2.)
     elif proj_point is not None:  # convert units, initial guess for crpix
         proj_point.transform_to(world_coords)
         wcs.wcs.crval = (proj_point.data.lon.deg, proj_point.data.lat.deg)
-        wcs.wcs.crpix = (close(lon-wcs.wcs.crval[0], xp),
-                         close(lon-wcs.wcs.crval[1], yp))
+        wcs.wcs.crpix = (xp[np.abs(lon - wcs.wcs.crval[0]).argmin()],
+                         yp[np.abs(lat - wcs.wcs.crval[1]).argmin()])
 
     # fit linear terms, assign to wcs
-    # use (1, 0, 0, 1) as initial guess, in case input wcs was passed in
-    # and cd terms are way off.
-    p0 = np.concatenate([wcs.wcs.cd.flatten(), wcs.wcs.crpix.flatten()])
-    
-    xpmin, xpmax, ypmin, ypmax = xp.min(), xp.max(), yp.min(), yp.max()
-    if xpmin==xpmax: xpmin, xpmax = xpmin-0.5, xpmax+0.5
-    if ypmin==ypmax: ypmin, ypmax = ypmin-0.5, ypmax+0.5
-
-    fit = least_squares(_linear_wcs_fit, p0,
-                        args=(lon, lat, xp, yp, wcs),
-                        bounds=[[-np.inf,-np.inf,-np.inf,-np.inf, xpmin, ypmin],
-                                [ np.inf, np.inf, np.inf, np.inf, xpmax, ypmax]])
-    wcs.wcs.crpix = np.array(fit.x[4:6])
-    wcs.wcs.cd = np.array(fit.x[0:4].reshape((2, 2)))
+    # The linear terms can be solved for directly: with CRVAL fixed, the projection
+    # plane (intermediate world) coordinates of the input points are
+    # CD . (p + 1 - CRPIX), which is linear in the CD and CRPIX terms.
+    # The least squares solver is only used as a fallback when the points
+    # don't constrain the system (e.g. all in a single row or column).
+    world_crd = np.column_stack((lon, lat)).astype(np.float64, order='C')
+    resid_buf = np.empty(2*len(xp))  # residual work array for the fit objectives
+    # (origin=1, because astropy applies the origin offset to imgcrd as well as pixcrd)
+    imgcrd = wcs.wcs.s2p(world_crd, 1)['imgcrd']
+    design = np.column_stack((xp + 1, yp + 1, np.ones(len(xp))))
+    coeffs, _, rank, _ = np.linalg.lstsq(design, imgcrd, rcond=None)
+
+    if rank == 3:
+        cd = coeffs[0:2].T
+        wcs.wcs.cd = cd
+        wcs.wcs.crpix = -np.linalg.solve(cd, coeffs[2])
+    else:
+        # use (1, 0, 0, 1) as initial guess, in case input wcs was passed in
+        # and cd terms are way off.
+        p0 = np.concatenate([wcs.wcs.cd.flatten(), wcs.wcs.crpix.flatten()])
+
+        xlo, xhi, ylo, yhi = xpmin, xpmax, ypmin, ypmax
+        if xlo==xhi: xlo, xhi = xlo-0.5, xhi+0.5
+        if ylo==yhi: ylo, yhi = ylo-0.5, yhi+0.5
+
+        pix_crd = np.empty((len(xp), 2), dtype=np.float64, order='C')
+        pix_crd[:, 0] = xp
+        pix_crd[:, 1] = yp
+
+        fit = least_squares(_linear_wcs_fit, p0,
+                            args=(lon, lat, pix_crd, wcs, resid_buf),
+                            bounds=[[-np.inf,-np.inf,-np.inf,-np.inf, xlo, ylo],
+                                    [ np.inf, np.inf, np.inf, np.inf, xhi, yhi]])
+        wcs.wcs.crpix = np.array(fit.x[4:6])
+        wcs.wcs.cd = np.array(fit.x[0:4].reshape((2, 2)))
 
     # fit SIP, if specified. Only fit forward coefficients
     if sip_degree:
@@ -360,16 +462,20 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         if '-SIP' not in wcs.wcs.ctype[0]:
             wcs.wcs.ctype = [x + '-SIP' for x in wcs.wcs.ctype]
 
-        coef_names = ['{0}_{1}'.format(i, j) for i in range(degree+1)
-                      for j in range(degree+1) if (i+j) < (degree+1) and
-                      (i+j) > 1]
+        # u and v exponents of each coefficient (A_i_j, B_i_j with 1 < i+j <= degree),
+        # so the objective can build the polynomial basis directly
+        u_exp, v_exp = np.array([(i, j) for i in range(degree+1)
+                                 for j in range(degree+1) if (i+j) < (degree+1) and
+                                 (i+j) > 1], dtype=np.intp).reshape((-1, 2)).T
+        num_coef = len(u_exp)
+
         p0 = np.concatenate((np.array(wcs.wcs.crpix), wcs.wcs.cd.flatten(),
-                             np.zeros(2*len(coef_names))))
+                             np.zeros(2*num_coef)))
+
+        sip_buf = np.empty((2, len(xp)))  # SIP polynomial work array for the fit objective
 
         fit = least_squares(_sip_fit, p0,
-                            args=(lon, lat, xp, yp, wcs, degree, coef_names))
-        coef_fit = (list(fit.x[6:6+len(coef_names)]),
-                    list(fit.x[6+len(coef_names):]))
+                            args=(world_crd, xp, yp, wcs, u_exp, v_exp, _get_sip_eval(), sip_buf, resid_buf))
 
         # put fit values in wcs
         wcs.wcs.cd = fit.x[2:6].reshape((2, 2))
@@ -378,9 +484,8 @@ def fit_wcs_from_points(xy, world_coords, proj_point='center',
         a_vals = np.zeros((degree+1, degree+1))
         b_vals = np.zeros((degree+1, degree+1))
 
-        for coef_name in coef_names:
-            a_vals[int(coef_name[0])][int(coef_name[2])] = coef_fit[0].pop(0)
-            b_vals[int(coef_name[0])][int(coef_name[2])] = coef_fit[1].pop(0)
+        a_vals[u_exp, v_exp] = fit.x[6:6+num_coef]
+        b_vals[u_exp, v_exp] = fit.x[6+num_coef:]
 
         wcs.sip = Sip(a_vals, b_vals, np.zeros((degree+1, degree+1)),
                       np.zeros((degree+1, degree+1)), wcs.wcs.crpix)